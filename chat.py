@@ -1,10 +1,13 @@
 # Chat Simulation API Module
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query
 from pydantic import BaseModel
 from typing import List
 from datetime import datetime
+from collections import deque
+from itertools import count, islice
 import random
 import asyncio
+import os
 
 router = APIRouter()
 
@@ -27,8 +30,14 @@ class ChatResponse(BaseModel):
 
 
 # In-memory storage for chat messages
-CHAT_MESSAGES: List[ChatMessage] = []
-message_id_counter = 1
+# Capped at CHAT_HISTORY_SIZE; once full, the oldest messages are dropped
+CHAT_HISTORY_SIZE = 10000
+CHAT_MESSAGES: deque[ChatMessage] = deque(maxlen=CHAT_HISTORY_SIZE)
+message_ids = count(1) # Yields the next message ID on each call to next()
+
+# Optional delay (in seconds) before the bot replies, to simulate processing time
+# Disabled by default; set CHAT_SIMULATE_DELAY=1 to bring back the old behaviour
+CHAT_SIMULATE_DELAY = float(os.getenv("CHAT_SIMULATE_DELAY", "0"))
 
 # Predefined bot replies
 # These are extremely generic
@@ -57,41 +66,82 @@ KEYWORD_REPLIES = {
 }
 
 
+def build_keyword_automaton(keyword_replies: dict) -> tuple:
+    # Build an Aho-Corasick automaton over the keywords so a message can be
+    # matched against every keyword in a single pass, however many there are
+    goto = [{}]    # state -> {character: next state}
+    fail = [0]     # state -> fallback state on mismatch
+    output = [None]  # state -> reply for a keyword ending at this state
+
+    # Insert each keyword into the trie
+    for keyword, reply in keyword_replies.items():
+        state = 0
+        for char in keyword.lower():
+            if char not in goto[state]:
+                goto.append({})
+                fail.append(0)
+                output.append(None)
+                goto[state][char] = len(goto) - 1
+            state = goto[state][char]
+        if output[state] is None:
+            output[state] = reply
+
+    # Breadth-first walk to wire up the failure links
+    queue = deque(goto[0].values())
+    while queue:
+        state = queue.popleft()
+        for char, next_state in goto[state].items():
+            queue.append(next_state)
+            fallback = fail[state]
+            while fallback and char not in goto[fallback]:
+                fallback = fail[fallback]
+            fail[next_state] = goto[fallback].get(char, 0)
+            # A state also matches any keyword that is a suffix of it
+            if output[next_state] is None:
+                output[next_state] = output[fail[next_state]]
+
+    return goto, fail, output
+
+KEYWORD_AUTOMATON = build_keyword_automaton(KEYWORD_REPLIES)
+
+
 def generate_bot_reply(user_message: str) -> str:
     
     # Convert message to lowercase for keyword matching
     message_lower = user_message.lower()
 
     # Check for keyword-based replies first
-    for keyword, reply in KEYWORD_REPLIES.items():
-        if keyword in message_lower:
-            return reply
+    # Walk the automaton once and reply to the first keyword found
+    goto, fail, output = KEYWORD_AUTOMATON
+    state = 0
+    for char in message_lower:
+        while state and char not in goto[state]:
+            state = fail[state]
+        state = goto[state].get(char, 0)
+        if output[state] is not None:
+            return output[state]
     # If no keywords matched, return a random generic reply
     return random.choice(BOT_REPLIES)
 
 def create_chat_message(sender: str, message: str) -> ChatMessage:
-    global message_id_counter
-    chat_message = ChatMessage(
-        id=message_id_counter,
+    return ChatMessage(
+        id=next(message_ids),
         sender=sender,
         message=message,
-        timestamp=datetime.now().isoformat()
+        timestamp=datetime.now()
     )
-    message_id_counter += 1
-    return chat_message
 
 @router.get("/", response_model=List[ChatMessage])
-async def get_chat_messages(limit: int = None, sender: str = None):
+async def get_chat_messages(limit: int = Query(None, ge=0), sender: str = None):
     
     # Retrieve chat messages with optional filtering by sender and limit.
   
-    messages = CHAT_MESSAGES.copy()
+    # Messages are appended in time order, so walking the deque backwards
+    # gives newest first without sorting or copying it
+    messages = reversed(CHAT_MESSAGES)
     if sender:
-        messages = [msg for msg in messages if msg.sender == sender]
-    messages = sorted(messages, key=lambda x: x.timestamp, reverse=True)
-    if limit:
-        messages = messages[:limit]
-    return messages
+        messages = (msg for msg in messages if msg.sender == sender)
+    return list(islice(messages, limit or None))
 
 @router.post("/", response_model=ChatResponse)
 async def post_chat_message(chat_request: ChatRequest):
@@ -103,8 +153,9 @@ async def post_chat_message(chat_request: ChatRequest):
     user_message = create_chat_message(sender=chat_request.sender, message=chat_request.message)
     CHAT_MESSAGES.append(user_message)
 
-    # Simulate Bot Reply Generation Delay
-    await asyncio.sleep(1)  # Simulate processing time
+    # Simulate Bot Reply Generation Delay (if configured)
+    if CHAT_SIMULATE_DELAY:
+        await asyncio.sleep(CHAT_SIMULATE_DELAY)
 
     # Generate Bot Reply
     bot_reply_text = generate_bot_reply(chat_request.message)
@@ -1,14 +1,22 @@
 # External API integration module
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, HTTPException, Query, Request, Response
 from pydantic import BaseModel
 from typing import List, Optional
+from operator import itemgetter
 import httpx
 import asyncio
+import hashlib
+import orjson
+import time
 
 router = APIRouter()
 
 POKEMON_API_URL = "https://pokeapi.co/api/v2/pokemon/"
 
+# Accessors for the type names in a PokeAPI payload: {"types": [{"type": {"name": ...}}]}
+_get_type = itemgetter("type")
+_get_name = itemgetter("name")
+
 # Defining the Pydantic model for the external data
 class Pokemon(BaseModel):
     id: int
@@ -24,43 +32,156 @@ class PokemonResponse(BaseModel):
     total: int
     has_more: bool
 
-POKEMON_CACHE = {} # Simple in-memory cache
+# Size-capped LRU cache built on a plain dict
+# Dicts keep insertion order, so the first key is always the least recently used
+class LRUCache(dict):
+    def __init__(self, maxsize: int):
+        super().__init__()
+        self.maxsize = maxsize
+
+    def get(self, key, default=None):
+        # On a hit, re-insert the entry to mark it as most recently used
+        if key not in self:
+            return default
+        value = self[key] = self.pop(key)
+        return value
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        if len(self) > self.maxsize:
+            self.pop(next(iter(self))) # Evict the least recently used entry
+
+POKEMON_CACHE_SIZE = 2048
+
+# In-memory cache
+# Holds a fetch task per Pokemon name so concurrent requests for the same name
+# share a single in-flight fetch instead of each hitting the API
+POKEMON_CACHE: dict[str, "asyncio.Task[Optional[Pokemon]]"] = LRUCache(POKEMON_CACHE_SIZE)
+
+# Shared HTTP client so connections to the PokeAPI are pooled and reused
+# Opened and closed by the app's startup/shutdown hooks in main.py
+_CLIENT: Optional[httpx.AsyncClient] = None
+
+
+async def open_client():
+    global _CLIENT
+    _CLIENT = httpx.AsyncClient(
+        timeout=10.0,
+        limits=httpx.Limits(max_connections=100, max_keepalive_connections=50),
+        http2=True
+    )
+
+async def close_client():
+    global _CLIENT
+    if _CLIENT is not None:
+        await _CLIENT.aclose()
+        _CLIENT = None
+
+# Cache of fully serialised listing pages, keyed by (page, limit, search)
+# Each entry is (JSON body, ETag, time cached) and expires after RESPONSE_CACHE_TTL seconds
+RESPONSE_CACHE_SIZE = 256
+RESPONSE_CACHE_TTL = 60
+RESPONSE_CACHE: LRUCache = LRUCache(RESPONSE_CACHE_SIZE)
+
+# Caps how many detail requests are sent to the PokeAPI at once
+_FETCH_SEM = asyncio.Semaphore(16)
+
+# Full list of Pokemon names, loaded once from the API and paginated locally
+_NAME_INDEX: List[str] = []
+_NAME_INDEX_LOCK = asyncio.Lock()
+
+# Search structures built alongside the name index
+# _NAMES_LOWER holds the lowercased names at the same positions as _NAME_INDEX,
+# and _BIGRAM_INDEX maps each two-letter sequence to the positions of names containing it
+_NAMES_LOWER: tuple = ()
+_BIGRAM_INDEX: dict[str, set[int]] = {}
+
+
+async def get_name_index() -> List[str]:
+    # Fetch every Pokemon name on first use; the lock stops concurrent
+    # requests from all loading the index at once
+    global _NAMES_LOWER
+    if _NAME_INDEX:
+        return _NAME_INDEX
+    async with _NAME_INDEX_LOCK:
+        if not _NAME_INDEX:
+            response = await _CLIENT.get(POKEMON_API_URL, params={"offset": 0, "limit": 100000})
+
+            if response.status_code != 200:
+                raise HTTPException(status_code=response.status_code, detail="Failed to fetch data from external API")
+
+            names = [item["name"] for item in orjson.loads(response.content)["results"]]
+            _NAMES_LOWER = tuple(name.lower() for name in names)
+            for i, name in enumerate(_NAMES_LOWER):
+                for j in range(len(name) - 1):
+                    _BIGRAM_INDEX.setdefault(name[j:j + 2], set()).add(i)
+            _NAME_INDEX.extend(names) # Filled last so the index only looks ready once complete
+    return _NAME_INDEX
+
+def search_name_index(search: str) -> List[str]:
+    # Return every indexed name containing the search term, in index order
+    needle = search.lower()
+    if len(needle) < 2:
+        return [_NAME_INDEX[i] for i, name in enumerate(_NAMES_LOWER) if needle in name]
+
+    # Only names containing every bigram of the search term can match,
+    # so intersect their postings (smallest first) before checking each candidate
+    bigrams = {needle[j:j + 2] for j in range(len(needle) - 1)}
+    postings = sorted((_BIGRAM_INDEX.get(bigram, set()) for bigram in bigrams), key=len)
+    candidates = set(postings[0]).intersection(*postings[1:])
+    return [_NAME_INDEX[i] for i in sorted(candidates) if needle in _NAMES_LOWER[i]]
 
 
 async def fetch_pokemon_details(name: str) -> Optional[Pokemon]:
 
     # First Check the Cache
-    if name.lower() in POKEMON_CACHE:
+    key = name.lower()
+    task = POKEMON_CACHE.get(key)
+    if task is not None:
         print(f"Cache hit for {name}")
-        return POKEMON_CACHE[name.lower()]
-    
+    else:
+        # Run the fetch as its own task so it isn't tied to any one caller,
+        # and register it before awaiting so other callers can join it
+        task = asyncio.create_task(request_pokemon_details(key))
+        task.add_done_callback(lambda done: evict_failed_fetch(key, done))
+        POKEMON_CACHE[key] = task
+
+    # Shield so a cancelled caller doesn't cancel the fetch for everyone else
+    return await asyncio.shield(task)
+
+def evict_failed_fetch(key: str, task: asyncio.Task):
+    # Only cache successful fetches; failed ones are removed so they can be retried
+    if task.cancelled() or task.exception() is not None or task.result() is None:
+        if key in POKEMON_CACHE and POKEMON_CACHE[key] is task:
+            del POKEMON_CACHE[key]
+
+async def request_pokemon_details(name: str) -> Optional[Pokemon]:
+    # Fetch a single Pokemon from the external API
     try:
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            response = await client.get(f"{POKEMON_API_URL}{name.lower()}")
-
-            if response.status_code == 200:
-                data = response.json()
-                
-                # Safely extract image URL
-                image_url = None
-                try:
-                    image_url = data["sprites"]["other"]["official-artwork"]["front_default"]
-                except (KeyError, TypeError):
-                    pass
-                
-                pokemon = Pokemon(
-                    id=data['id'],
-                    name=data['name'],
-                    height=data['height'],
-                    weight=data['weight'],
-                    types=[t["type"]["name"] for t in data["types"]],
-                    image_url=image_url
-                )
-
-                POKEMON_CACHE[name.lower()] = pokemon # Cache the result
-                return pokemon 
-            else:
-                return None
+        async with _FETCH_SEM:
+            response = await _CLIENT.get(f"{POKEMON_API_URL}{name}")
+
+        if response.status_code == 200:
+            data = orjson.loads(response.content) # Parse the raw bytes directly
+            
+            # Safely extract image URL
+            image_url = None
+            try:
+                image_url = data["sprites"]["other"]["official-artwork"]["front_default"]
+            except (KeyError, TypeError):
+                pass
+            
+            # The PokeAPI payload shape is trusted, so skip Pydantic validation
+            return Pokemon.model_construct(
+                id=data['id'],
+                name=data['name'],
+                height=data['height'],
+                weight=data['weight'],
+                types=list(map(_get_name, map(_get_type, data["types"]))),
+                image_url=image_url
+            )
+        else:
+            return None
     except (httpx.TimeoutException, httpx.RequestError) as e:
         # Handle Network Errors
         print(f"Error fetching data for {name}: {str(e)}")
@@ -68,6 +189,7 @@ async def fetch_pokemon_details(name: str) -> Optional[Pokemon]:
 
 @router.get("/", response_model=PokemonResponse)
 async def get_pokemon_data(
+    request: Request,
     page: int = Query(1, ge=1, description="Page number for pagination"), 
     limit: int = Query(10, ge=1, le=50, description="Number of items per page (max 50)"),
     search: Optional[str] = Query(None, description="Search term for Pokemon name")
@@ -77,71 +199,53 @@ async def get_pokemon_data(
 # Example: /external_data/?page=1&limit=10 - will return the first 10 Pokemon
 # Example: /external_data/?search=char - will return all Pokemon with "char" in their name
 
-    try:
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            # If searching, fetch a larger set to search through (up to 1000 pokemon)
+    # Serve a recently built page straight from the response cache
+    key = (page, limit, search.lower() if search else None)
+    cached = RESPONSE_CACHE.get(key)
+    if cached is not None and time.monotonic() - cached[2] < RESPONSE_CACHE_TTL:
+        body, etag, _ = cached
+    else:
+        try:
+            names = await get_name_index()
+            offset = (page - 1) * limit
+
             if search:
-                # Fetch more results to search through
-                response = await client.get(POKEMON_API_URL, params={"offset": 0, "limit": 1000})
-                
-                if response.status_code != 200:
-                    raise HTTPException(status_code=response.status_code, detail="Failed to fetch data from external API")
-                
-                data = response.json()
-                results = data["results"]
-                
-                # Filter by search term
-                results = [item for item in results if search.lower() in item["name"].lower()]
-                
-                # Apply pagination to filtered results
-                offset = (page - 1) * limit
-                total_filtered = len(results)
-                results = results[offset:offset + limit]
-                
-                # Fetch detailed data for each Pokemon concurrently
-                tasks = [fetch_pokemon_details(item["name"]) for item in results]
-                pokemons = await asyncio.gather(*tasks)
-                
-                # Filter out None results (failed fetches)
-                pokemons = [p for p in pokemons if p is not None]
-                
-                has_more = (offset + limit) < total_filtered
-                
-                return PokemonResponse(
-                    pokemon=pokemons,
-                    page=page,
-                    total=total_filtered,
-                    has_more=has_more
-                )
-            else:
-                # Normal pagination without search
-                offset = (page - 1) * limit
-                response = await client.get(POKEMON_API_URL, params={"offset": offset, "limit": limit})
-
-                if response.status_code != 200:
-                    raise HTTPException(status_code=response.status_code, detail="Failed to fetch data from external API")
-
-                data = response.json()
-                results = data["results"]
-                total = data["count"]
-
-                # Fetch detailed data for each Pokemon concurrently
-                tasks = [fetch_pokemon_details(item["name"]) for item in results]
-                pokemons = await asyncio.gather(*tasks)
-
-                # Filter out None results (failed fetches)
-                pokemons = [p for p in pokemons if p is not None]
-
-                has_more = (offset + limit) < total
-
-                return PokemonResponse(
-                    pokemon=pokemons,
-                    page=page,
-                    total=total,
-                    has_more=has_more
-                )
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
+                # Filter the cached names by search term and take just this page
+                names = search_name_index(search)
+
+            total = len(names)
+            page_names = names[offset:offset + limit]
+
+            # Fetch detailed data for each Pokemon concurrently
+            # One failed fetch shouldn't fail the whole page, so collect exceptions too
+            tasks = [fetch_pokemon_details(name) for name in page_names]
+            pokemons = await asyncio.gather(*tasks, return_exceptions=True)
+
+            # Filter out None results and exceptions (failed fetches)
+            pokemons = [p for p in pokemons if isinstance(p, Pokemon)]
+
+            has_more = (offset + limit) < total
+
+            pokemon_response = PokemonResponse(
+                pokemon=pokemons,
+                page=page,
+                total=total,
+                has_more=has_more
+            )
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
+
+        body = orjson.dumps(pokemon_response.model_dump())
+        etag = f'"{hashlib.blake2b(body, digest_size=8).hexdigest()}"'
+
+        # Only cache complete pages so a failed fetch isn't served for the whole TTL
+        if len(pokemons) == len(page_names):
+            RESPONSE_CACHE[key] = (body, etag, time.monotonic())
+
+    # Clients that already have this page get a 304 with no body
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+    return Response(content=body, media_type="application/json", headers={"ETag": etag})
     
 @router.get("/{pokemon_name}", response_model=Pokemon)
 async def get_pokemon_by_name(pokemon_name: str):
@@ -1,26 +1,38 @@
 # This is the main FastAPI application file
 
-from fastapi import FastAPI, Query
-from fastapi.responses import HTMLResponse
+from fastapi import FastAPI, Query, Request
+from fastapi.responses import HTMLResponse, ORJSONResponse, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 import uvicorn
+import hashlib
 import os
 
 # Import routers from other modules
 from timeline import router as timeline_router
-from external_api import router as external_data_router
+from external_api import router as external_data_router, open_client, close_client
 from chat import router as chat_router
 
 
 # Create FastAPI app
+# JSON responses are encoded with orjson, which is much faster than the standard library
 app = FastAPI(title="CareMixer Technical Assessment API",
               description="Basic Rest API with Timeline, External Data and Chat Features",
-              version="1.0.0")
+              version="1.0.0",
+              default_response_class=ORJSONResponse)
+
+# Compress larger responses (e.g. Pokemon listings) before sending them
+# Added before CORS so CORS wraps it and its headers are applied to compressed responses too
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
 
 # Enable CORS for frontend communication
+# CORS_ALLOW_ORIGINS is a comma-separated list of origins allowed to call the API from another site
+# Empty by default, since the bundled chat UI is served from the same origin; set it to "*" to allow all origins
+CORS_ALLOW_ORIGINS = [origin.strip() for origin in os.getenv("CORS_ALLOW_ORIGINS", "").split(",") if origin.strip()]
+
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],  # Allow all origins for development
+    allow_origins=CORS_ALLOW_ORIGINS,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
@@ -33,12 +45,28 @@ app.include_router(timeline_router, prefix="/timeline", tags=["Timeline"])
 app.include_router(external_data_router, prefix="/external_data", tags=["External Data"])
 app.include_router(chat_router, prefix="/chat", tags=["Chat"])
 
+# Open the shared PokeAPI client once and close it when the server stops
+@app.on_event("startup")
+async def startup():
+    await open_client()
+
+@app.on_event("shutdown")
+async def shutdown():
+    await close_client()
+
+# Read the chat HTML interface once at startup and serve it from memory
+with open(os.path.join(os.path.dirname(__file__), "chat.html"), "r", encoding="utf-8") as f:
+    CHAT_HTML = f.read()
+CHAT_HTML_ETAG = f'"{hashlib.md5(CHAT_HTML.encode("utf-8")).hexdigest()}"'
+CHAT_HTML_HEADERS = {"Cache-Control": "public, max-age=300", "ETag": CHAT_HTML_ETAG}
+
 @app.get("/chat-ui", response_class=HTMLResponse)
-async def chat_ui():
+async def chat_ui(request: Request):
     # Serve the chat HTML interface
-    chat_html_path = os.path.join(os.path.dirname(__file__), "chat.html")
-    with open(chat_html_path, "r", encoding="utf-8") as f:
-        return f.read()
+    # Browsers that already have this version get a 304 with no body
+    if request.headers.get("if-none-match") == CHAT_HTML_ETAG:
+        return Response(status_code=304, headers=CHAT_HTML_HEADERS)
+    return HTMLResponse(CHAT_HTML, headers=CHAT_HTML_HEADERS)
 
 @app.get("/")
 async def root():
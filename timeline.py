@@ -3,6 +3,7 @@ from fastapi import APIRouter, HTTPException, Query
 from pydantic import BaseModel 
 from typing import List, Optional
 from datetime import datetime, timedelta
+from itertools import islice
 
 router = APIRouter()
 
@@ -30,32 +31,34 @@ TIMELINE_EVENTS = [
     TimelineEvent(id=12, title="Vaccination Administered", description="Administered flu vaccination", timestamp=datetime.now() - timedelta(hours=8), message="Flu vaccination administered.", type="Audit")
 ]
 
+# Keep the events sorted by timestamp descending so requests don't need to sort
+TIMELINE_EVENTS.sort(key=lambda x: x.timestamp, reverse=True)
+
+# Lookup table for fetching a single event by ID
+# If events are ever added at runtime, update this alongside TIMELINE_EVENTS
+EVENTS_BY_ID = {event.id: event for event in TIMELINE_EVENTS}
+
 # This endpoint retrieves timeline events with optional filtering and limiting
 # Example: /timeline/?type=Audit&limit=5 will return the latest 5 Note events
 # /timeline/?limit=3 will return the latest 3 events of any type
 @router.get("/", response_model=List[TimelineEvent])
 async def get_timeline(type: Optional[str] = Query(None, description="Filter by event type (Note/Audit)"),
-                       limit: Optional[int] = Query(10, description="Limit the number of events returned")):
+                       limit: Optional[int] = Query(10, ge=0, description="Limit the number of events returned")):
     
-    events = TIMELINE_EVENTS.copy() # Start with all Events
+    events = iter(TIMELINE_EVENTS) # Start with all Events (already newest first)
     if type:
-        events = [event for event in events if event.type == type] # Filter by type if provided
+        events = (event for event in events if event.type == type) # Filter by type if provided
 
-    events = sorted(events, key=lambda x: x.timestamp, reverse=True) # Sort by timestamp descending
-
-    if limit:
-        events = events[:limit] # Apply limit if provided
-    
-    return events
+    return list(islice(events, limit or None)) # Apply limit if provided
 
 # This endpoint retrieves a specific timeline event by its ID
 # Example: /timeline/3 will return the event with ID 3
 @router.get("/{event_id}", response_model=TimelineEvent)
 async def get_timeline_event(event_id: int):
-    for event in TIMELINE_EVENTS:
-        if event.id == event_id:
-            return event
-    # If not found, raise 404
-    raise HTTPException(status_code=404, detail="Timeline event not found")
+    event = EVENTS_BY_ID.get(event_id)
+    if event is None:
+        # If not found, raise 404
+        raise HTTPException(status_code=404, detail="Timeline event not found")
+    return event
 
     